@@ -31,12 +31,15 @@ def read_traces(filename: str) -> None:
     print(f"{'Channel ID':<26} {'Start Time':<30} {'End Time':<30} {'Sample Rate'}")
     print("-" * 95)
 
-    # Print trace information
+    # Print trace information, writing the lines for each trace at once
     for trace in traces:
+        sourceid = trace.sourceid
+        lines = []
         for segment in trace:
             start_time = segment.starttime_str(subsecond=SubSecond.NANO_MICRO)
             end_time = segment.endtime_str(subsecond=SubSecond.NANO_MICRO)
-            print(f"{trace.sourceid:<26} {start_time:<30} {end_time:<30} {segment.samprate}")
+            lines.append(f"{sourceid:<26} {start_time:<30} {end_time:<30} {segment.samprate}\n")
+        sys.stdout.write("".join(lines))
 
 
 def main():
@@ -17,6 +17,9 @@ import sys
 
 from pymseed import MS3Record, nstime2timestr
 
+# Output buffer size, large enough to coalesce many records into each write
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
 
 class StreamStats:
     """Accumulate statistics from a stream of miniSEED records."""
@@ -27,6 +30,10 @@ class StreamStats:
         self.bytes = 0
         self.sourceids = {}  # Per-sourceid statistics
 
+        # Statistics of the last sourceid seen, records commonly arrive in runs
+        self._last_sid = None
+        self._last_stats = None
+
     def __str__(self):
         """Return a string representation of the statistics."""
         printer = pprint.PrettyPrinter(indent=4, sort_dicts=False)
@@ -53,32 +60,43 @@ class StreamStats:
 
     def update(self, msr):
         """Update statistics with data from a miniSEED record."""
+        # Read each record field once, every access reads from the C structure
+        samplecnt = msr.samplecnt
+        reclen = msr.reclen
+        starttime = msr.starttime
+        endtime = msr.endtime
+
         # Update global statistics
         self.record_count += 1
-        self.sample_count += msr.samplecnt
-        self.bytes += msr.reclen
+        self.sample_count += samplecnt
+        self.bytes += reclen
 
         # Track per-sourceid statistics
         sid = msr.sourceid
-        if sid not in self.sourceids:
-            self.sourceids[sid] = {
-                "record_count": 0,
-                "sample_count": 0,
-                "bytes": 0,
-                "earliest": None,
-                "latest": None,
-            }
-
-        sid_stats = self.sourceids[sid]
+        if sid == self._last_sid:
+            sid_stats = self._last_stats
+        else:
+            sid_stats = self.sourceids.get(sid)
+            if sid_stats is None:
+                sid_stats = self.sourceids[sid] = {
+                    "record_count": 0,
+                    "sample_count": 0,
+                    "bytes": 0,
+                    "earliest": starttime,
+                    "latest": endtime,
+                }
+            self._last_sid = sid
+            self._last_stats = sid_stats
+
         sid_stats["record_count"] += 1
-        sid_stats["sample_count"] += msr.samplecnt
-        sid_stats["bytes"] += msr.reclen
+        sid_stats["sample_count"] += samplecnt
+        sid_stats["bytes"] += reclen
 
-        if sid_stats["earliest"] is None or msr.starttime < sid_stats["earliest"]:
-            sid_stats["earliest"] = msr.starttime
+        if starttime < sid_stats["earliest"]:
+            sid_stats["earliest"] = starttime
 
-        if sid_stats["latest"] is None or msr.endtime > sid_stats["latest"]:
-            sid_stats["latest"] = msr.endtime
+        if endtime > sid_stats["latest"]:
+            sid_stats["latest"] = endtime
 
 
 def main():
@@ -87,12 +105,13 @@ def main():
 
     # Read miniSEED from stdin and accumulate stats for each record
     stats = StreamStats()
-    for msr in MS3Record.from_file(sys.stdin.fileno()):
-        # Update statistics with data from the record
-        stats.update(msr)
+    with open(sys.stdout.fileno(), "wb", buffering=OUTPUT_BUFFER_SIZE, closefd=False) as output:
+        for msr in MS3Record.from_file(sys.stdin.fileno()):
+            # Update statistics with data from the record
+            stats.update(msr)
 
-        # Write raw miniSEED record to stdout
-        sys.stdout.buffer.write(msr.record)
+            # Write raw miniSEED record to stdout
+            output.write(msr.record)
 
     print(stats, file=sys.stderr)
 
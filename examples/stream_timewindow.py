@@ -17,6 +17,13 @@ import sys
 
 from pymseed import NSTMODULUS, MS3Record, timestr2nstime
 
+# Output buffer size, large enough to coalesce many records into each write
+OUTPUT_BUFFER_SIZE = 4 * 1024 * 1024
+
+# Bounds standing in for an open end of the time window, beyond any time value
+NSTIME_MIN = -(1 << 63)
+NSTIME_MAX = (1 << 63) - 1
+
 
 def process_stream(args):
     """Process miniSEED records from stdin, applying time window selection."""
@@ -25,25 +32,29 @@ def process_stream(args):
 
     print("Reading miniSEED from stdin, writing to stdout", file=sys.stderr)
 
+    # Bind the time window to locals, with an open end set beyond any time so
+    # that each test in the loop is a plain comparison
+    earliest = NSTIME_MIN if args.earliest is None else args.earliest
+    latest = NSTIME_MAX if args.latest is None else args.latest
+
     # Read miniSEED from stdin
-    for msr in MS3Record.from_file(sys.stdin.fileno()):
-        # Skip records completely outside the time window
-        if (args.earliest and msr.endtime < args.earliest) or (
-            args.latest and msr.starttime > args.latest
-        ):
-            continue
-        # Trim if record overlaps with time window boundaries
-        output_record = msr.record
-        if (args.earliest and msr.starttime < args.earliest <= msr.endtime) or (
-            args.latest and msr.starttime <= args.latest < msr.endtime
-        ):
-            trimmed_record = trim_record(msr, args.earliest, args.latest)
-            if trimmed_record:
-                output_record = trimmed_record
-        # Write record to stdout
-        sys.stdout.buffer.write(output_record)
-        records_written += 1
-        bytes_written += msr.reclen
+    with open(sys.stdout.fileno(), "wb", buffering=OUTPUT_BUFFER_SIZE, closefd=False) as output:
+        for msr in MS3Record.from_file(sys.stdin.fileno()):
+            starttime = msr.starttime
+            endtime = msr.endtime
+            # Skip records completely outside the time window
+            if endtime < earliest or starttime > latest:
+                continue
+            # Trim if record, known to overlap the window, extends beyond it
+            output_record = msr.record
+            if starttime < earliest or endtime > latest:
+                trimmed_record = trim_record(msr, earliest, latest)
+                if trimmed_record:
+                    output_record = trimmed_record
+            # Write record to stdout
+            output.write(output_record)
+            records_written += 1
+            bytes_written += msr.reclen
 
     print(f"Wrote {records_written} records, {bytes_written} bytes", file=sys.stderr)
 
@@ -54,25 +65,32 @@ def trim_record(msr, earliest, latest):
     if msr.samplecnt == 0 and msr.samprate == 0.0:
         return None
 
-    # Re-parse the single miniSEED record and decode the data samples
-    msr_trimmed = MS3Record.parse(msr.record, unpack_data=True)
+    # Re-parse the single miniSEED record and decode the data samples, directly
+    # from the original record's memory, which outlives the re-parsed record
+    msr_trimmed = MS3Record.parse(msr.record_mv, unpack_data=True)
 
-    data_samples = msr_trimmed.datasamples[:]
+    # A view of the decoded samples; slicing it below, and packing from the
+    # slice, do not copy the samples
+    data_samples = msr_trimmed.datasamples
     start_time = msr_trimmed.starttime
     end_time = msr_trimmed.endtime
     sample_period_ns = int(NSTMODULUS / msr_trimmed.samprate)
 
     # Trim early samples to the earliest time
-    if earliest and start_time < earliest <= end_time:
-        # Use ceiling division to ensure we skip enough samples
-        samples_to_skip = -((start_time - earliest) // sample_period_ns)
+    if start_time < earliest <= end_time:
+        # Round up to ensure we skip enough samples
+        samples_to_skip, remainder = divmod(earliest - start_time, sample_period_ns)
+        if remainder:
+            samples_to_skip += 1
         start_time += samples_to_skip * sample_period_ns
         data_samples = data_samples[samples_to_skip:]
 
     # Trim late samples to the latest time
-    if latest and start_time <= latest < end_time:
-        # Use ceiling division to ensure we remove enough samples
-        samples_to_remove = -((latest - end_time) // sample_period_ns)
+    if start_time <= latest < end_time:
+        # Round up to ensure we remove enough samples
+        samples_to_remove, remainder = divmod(end_time - latest, sample_period_ns)
+        if remainder:
+            samples_to_remove += 1
         data_samples = data_samples[:-samples_to_remove] if samples_to_remove > 0 else data_samples
 
     if not data_samples:
@@ -80,13 +98,9 @@ def trim_record(msr, earliest, latest):
 
     # Pack the trimmed record
     msr_trimmed.starttime = start_time
-    record_buffer = b""
-    for packed_record in msr_trimmed.generate(
-        data_samples=data_samples, sample_type=msr_trimmed.sampletype
-    ):
-        record_buffer += packed_record
-
-    return record_buffer
+    return b"".join(
+        msr_trimmed.generate(data_samples=data_samples, sample_type=msr_trimmed.sampletype)
+    )
 
 
 def parse_timestr(timestr):
@@ -122,10 +136,10 @@ def main():
     args = parser.parse_args()
 
     # Validate time arguments
-    if args.earliest and args.latest and args.earliest > args.latest:
+    if args.earliest is not None and args.latest is not None and args.earliest > args.latest:
         parser.error("Earliest time cannot be after latest time")
 
-    if not args.earliest and not args.latest:
+    if args.earliest is None and args.latest is None:
         parser.error("At least one of --earliest or --latest must be specified")
 
     try:
@@ -37,34 +37,34 @@ This file is part of the the Python pymseed package.
 Copyright (c) 2026, EarthScope Data Services
 """
 
-import math
+import numpy as np
 
 from pymseed import MS3TraceList, sample_time, timestr2nstime
 
 output_file = "output.mseed"
 
 
-def sine_generator(start_degree=0, yield_count=100, total=1000):
-    """A generator returning a continuing sequence for a sine values."""
+def sine_generator(start_degrees=(0,), yield_count=100, total=1000):
+    """A generator returning continuing sequences of sine values, one row per
+    starting degree."""
+    start_degrees = np.asarray(start_degrees, dtype=np.float64)[:, np.newaxis]
     generated = 0
     while generated < total:
         bite_size = min(yield_count, total - generated)
 
-        # Yield a list of continuing sine values
-        yield [
-            int(math.sin(math.radians(x)) * 500)
-            for x in range(start_degree, start_degree + bite_size)
-        ]
+        # Yield an int32 array of continuing sine values for all channels,
+        # computed in one vectorized pass.  Each row of the array is contiguous
+        # and used by add_data() without copying.
+        degrees = start_degrees + np.arange(generated, generated + bite_size, dtype=np.float64)
+        yield (np.sin(np.deg2rad(degrees)) * 500).astype(np.int32)
 
-        start_degree += bite_size
         generated += bite_size
 
 
-# Define 3 generators with offset starting degrees
+# Define a generator for 3 channels with offset starting degrees
+sourceids = ("FDSN:XX_TEST__B_S_0", "FDSN:XX_TEST__B_S_1", "FDSN:XX_TEST__B_S_2")
 generate_yield_count = 100
-sine0 = sine_generator(start_degree=0, yield_count=generate_yield_count)
-sine1 = sine_generator(start_degree=45, yield_count=generate_yield_count)
-sine2 = sine_generator(start_degree=90, yield_count=generate_yield_count)
+sine = sine_generator(start_degrees=(0, 45, 90), yield_count=generate_yield_count)
 
 output_file = open(output_file, "wb")
 
@@ -81,30 +81,16 @@ max_record_length = 512
 # This could be any data collection operation that continually
 # adds samples to the trace list.
 for _ in range(10):
-    # Add new synthetic data to each trace using generators
-    traces.add_data(
-        sourceid="FDSN:XX_TEST__B_S_0",
-        data_samples=next(sine0),
-        sample_type="i",
-        sample_rate=sample_rate,
-        starttime=starttime,
-    )
-
-    traces.add_data(
-        sourceid="FDSN:XX_TEST__B_S_1",
-        data_samples=next(sine1),
-        sample_type="i",
-        sample_rate=sample_rate,
-        starttime=starttime,
-    )
-
-    traces.add_data(
-        sourceid="FDSN:XX_TEST__B_S_2",
-        data_samples=next(sine2),
-        sample_type="i",
-        sample_rate=sample_rate,
-        starttime=starttime,
-    )
+    # Add new synthetic data to each trace, one row of samples per channel
+    channel_samples = next(sine)
+    for sourceid, data_samples in zip(sourceids, channel_samples, strict=True):
+        traces.add_data(
+            sourceid=sourceid,
+            data_samples=data_samples,
+            sample_type="i",
+            sample_rate=sample_rate,
+            starttime=starttime,
+        )
 
     # Update the start time for the next iteration of synthetic data
     starttime = sample_time(starttime, generate_yield_count, sample_rate)
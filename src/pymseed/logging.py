@@ -116,11 +116,12 @@ def configure_logging(
     # Pin only after ms_rloginit() has repointed libmseed at the new buffers, so
     # dropping the previous ones cannot leave a dangling pointer.  libmseed
     # leaves a prefix passed as NULL unchanged, so keep its buffer pinned.
+    prefixes = _thread_local_prefixes
     if log_prefix is not None:
-        _thread_local_prefixes.log_prefix = c_log_prefix
+        prefixes.log_prefix = c_log_prefix
     if error_prefix is not None:
-        _thread_local_prefixes.error_prefix = c_error_prefix
-    _thread_local_prefixes.configured = True
+        prefixes.error_prefix = c_error_prefix
+    prefixes.configured = True
 
     _inherited_config = (log_prefix, error_prefix, max_messages)
 
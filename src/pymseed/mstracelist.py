@@ -234,13 +234,11 @@ class MS3RecordList:
             if key < 0 or key >= length:
                 raise IndexError("list index out of range")
 
-            # Find and return the record at the specified index
-            for i, record in enumerate(self):
-                if i == key:
-                    return record
-
-            # This shouldn't happen if our logic is correct
-            raise IndexError("list index out of range")
+            # Walk to the record at the specified index, wrapping only that one
+            current_record = self._list.first
+            for _ in range(key):
+                current_record = current_record.next
+            return MS3RecordPtr(current_record, self._parent_tracelist)
         else:
             raise TypeError("indices must be integers or slices")
 
@@ -616,7 +614,8 @@ class MS3TraceSeg:
 
         Note:
             - Requires the segment to have been created with `record_list=True`
-            - Can only be called once per segment if using internal memory (buffer=None)
+            - Unpacking into internal memory (buffer=None) happens once per segment;
+              further calls return the sample count without decoding again
             - If using a provided buffer, the buffer format must match the segment's
               sample type (int32 for "i", float32 for "f", float64 for "d", bytes for "t")
             - For performance, use memoryviews with matching dtype when providing buffers
@@ -709,11 +708,16 @@ class MS3TraceSeg:
             to unpack data into a buffer provided by the caller in order to avoid
             copying the data.
         """
-        if not self.recordlist:
+        if not self._seg.recordlist:
             raise ValueError("No record list available to unpack")
 
-        if self.datasamples and buffer is not None:
-            raise ValueError("Data samples already unpacked")
+        if self._seg.numsamples > 0:
+            if buffer is not None:
+                raise ValueError("Data samples already unpacked")
+
+            # All samples already decoded into internal memory, nothing to do
+            if self._seg.numsamples == self._seg.samplecnt:
+                return self._seg.numsamples
 
         buffer_ptr = ffi.NULL
         buffer_size = 0
@@ -843,13 +847,11 @@ class MS3TraceID:
             if key < 0 or key >= length:
                 raise IndexError("list index out of range")
 
-            # Find and return the segment at the specified index
-            for i, segment in enumerate(self):
-                if i == key:
-                    return segment
-
-            # This shouldn't happen if our logic is correct
-            raise IndexError("list index out of range")
+            # Walk to the segment at the specified index, wrapping only that one
+            current_segment = self._id.first
+            for _ in range(key):
+                current_segment = current_segment.next
+            return MS3TraceSeg(current_segment, self._id, self._parent_tracelist)
         else:
             raise TypeError("indices must be integers or slices")
 
@@ -1219,13 +1221,11 @@ class MS3TraceList:
             if key < 0 or key >= length:
                 raise IndexError("list index out of range")
 
-            # Find and return the trace ID at the specified index
-            for i, traceid in enumerate(self):
-                if i == key:
-                    return traceid
-
-            # This shouldn't happen if our logic is correct
-            raise IndexError("list index out of range")
+            # Walk to the trace ID at the specified index, wrapping only that one
+            current_traceid = self._mstl.traces.next[0]
+            for _ in range(key):
+                current_traceid = current_traceid.next[0]
+            return MS3TraceID(current_traceid, self)
         else:
             raise TypeError("indices must be integers or slices")
 
@@ -1254,8 +1254,13 @@ class MS3TraceList:
 
     def sourceids(self) -> Iterator[str]:
         """Return source IDs via a generator iterator"""
-        for traceid in self:
-            yield traceid.sourceid
+        self._check_open()
+
+        # Read each ID straight from the C list, without an MS3TraceID per entry
+        current_traceid = self._mstl.traces.next[0]
+        while current_traceid != ffi.NULL:
+            yield ffi.string(current_traceid.sid).decode("utf-8")
+            current_traceid = current_traceid.next[0]
 
     def print(
         self,
@@ -152,6 +152,25 @@ class TestLoggingCapture:
         assert messages
         assert not messages[0].startswith("[GONE] ")
 
+    def test_pop_buffer_reused_within_thread(self) -> None:
+        """get_error_messages() allocates its pop buffer once per thread and
+        decodes each message by the length libmseed returns, so no stale bytes
+        from a longer earlier message survive in a shorter later one."""
+        from pymseed import logging as pymseed_logging
+
+        configure_logging(error_prefix="[A LONGER PREFIX THAN THE NEXT] ")
+        first = self._emit_error_message()
+        buf = pymseed_logging._thread_local_rlog_pop_buf.buf
+
+        configure_logging(error_prefix="")
+        second = self._emit_error_message()
+
+        assert pymseed_logging._thread_local_rlog_pop_buf.buf is buf
+        assert first and second
+        assert len(second[0]) < len(first[0])
+        assert "\x00" not in second[0]
+        assert first[0].endswith(second[0])
+
     def test_get_error_messages_returns_empty_list_when_empty(self) -> None:
         """Test that get_error_messages returns empty list when no messages."""
         result = get_error_messages()
@@ -5,10 +5,13 @@ This module tests that configure_logging works correctly when called from
 multiple threads, with each thread having its own log/error prefix.
 """
 
+import functools
+import multiprocessing
 import os
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from glob import glob
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import repeat
 from typing import Any
 
 import pytest
@@ -28,24 +31,38 @@ TEST_DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 TEST_MSEED3_FILE = os.path.join(TEST_DATA_DIR, "testdata-COLA-signal.mseed3")
 
 
+@pytest.fixture(scope="session")
+def shared_executor() -> Iterator[ThreadPoolExecutor]:
+    """A thread pool reused by the tests that fan work out over threads.
+
+    Tests of threads that never configured logging must not use it: its
+    workers keep the per-thread logging state of earlier tests.
+    """
+    with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2)) as executor:
+        yield executor
+
+
+@functools.cache
+def available_test_files() -> tuple[str, ...]:
+    """Get the test data files, scanning the directory once."""
+    with os.scandir(TEST_DATA_DIR) as entries:
+        return tuple(sorted(e.path for e in entries if ".mseed" in e.name and e.is_file()))
+
+
 def get_test_files(count: int = 20) -> list[str]:
     """Get a list of test files for threaded reading.
 
     Returns multiple copies of available test files to simulate
     reading many files in parallel.
     """
-    # Get all available test files
-    pattern = os.path.join(TEST_DATA_DIR, "*.mseed*")
-    available_files = glob(pattern)
+    available_files = available_test_files()
 
     if not available_files:
         return []
 
     # Repeat files to get desired count (same file can be read multiple times)
-    files = []
-    while len(files) < count:
-        files.extend(available_files)
-    return files[:count]
+    repeats = -(-count // len(available_files))
+    return list(available_files * repeats)[:count]
 
 
 def get_payload_corrupted_buffer() -> bytes:
@@ -66,18 +83,67 @@ def get_payload_corrupted_buffer() -> bytes:
     return bytes(buf)
 
 
+@functools.cache
 def get_corrupted_record() -> bytes:
-    """Get a corrupted miniSEED record that will trigger a CRC error."""
+    """Get a corrupted miniSEED record that will trigger a CRC error.
+
+    The record is built once and shared; bytes are immutable, so threads can
+    parse the same object safely.
+    """
     for msr in MS3Record.from_file(TEST_MSEED3_FILE):
-        valid_data = bytearray(msr.record)
-        # Corrupt some bytes to trigger CRC validation error
-        valid_data[100] = 0xFF
-        valid_data[101] = 0xFF
-        valid_data[102] = 0xFF
+        # Copy straight from the record's memory, then corrupt some bytes to
+        # trigger CRC validation error
+        valid_data = bytearray(msr.record_mv)
+        valid_data[100:103] = b"\xff\xff\xff"
         return bytes(valid_data)
     raise RuntimeError("Could not read test data")
 
 
+def spawn_process_pool(max_workers: int) -> ProcessPoolExecutor:
+    """Create a process pool whose workers are started fresh.
+
+    Forking would copy a process already running threads, such as those of
+    the shared executor, which can leave a child holding a lock forever.
+    """
+    return ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    )
+
+
+def read_file_with_logging(args: tuple[int, str]) -> dict[str, Any]:
+    """Read a file with worker-specific logging configuration.
+
+    Defined at module level so that process pools can pickle it.
+    """
+    thread_id, filename = args
+    thread_name = threading.current_thread().name
+
+    log_prefix = f"[{thread_name}-LOG] "
+    error_prefix = f"[{thread_name}-ERR] "
+
+    configure_logging(log_prefix=log_prefix, error_prefix=error_prefix)
+
+    try:
+        traces = MS3TraceList.from_file(filename, unpack_data=True)
+        segment_count = sum(len(tid) for tid in traces)
+        success = True
+    except Exception:
+        segment_count = 0
+        success = False
+
+    messages = get_error_messages()
+
+    return {
+        "thread_id": thread_id,
+        "thread_name": thread_name,
+        "filename": os.path.basename(filename),
+        "segment_count": segment_count,
+        "success": success,
+        "message_count": len(messages),
+        "messages": messages,
+    }
+
+
 class TestThreadedLogging:
     """Tests for logging in multi-threaded contexts."""
 
@@ -85,12 +151,10 @@ class TestThreadedLogging:
         """Clear any existing log messages before each test."""
         clear_error_messages()
 
-    def test_configure_logging_per_thread(self) -> None:
+    def test_configure_logging_per_thread(self, shared_executor: ThreadPoolExecutor) -> None:
         """Test that each thread can configure its own logging prefix."""
-        results: dict[str, dict[str, Any]] = {}
-        results_lock = threading.Lock()
 
-        def thread_worker(thread_id: int, filename: str) -> None:
+        def thread_worker(thread_id: int, filename: str) -> dict[str, Any]:
             """Worker that configures logging and reads a file."""
             log_prefix = f"[T{thread_id}-LOG] "
             error_prefix = f"[T{thread_id}-ERR] "
@@ -98,88 +162,56 @@ class TestThreadedLogging:
             # Configure logging for this thread
             configure_logging(log_prefix=log_prefix, error_prefix=error_prefix)
 
-            # Read a file to exercise the library
+            # Read a file to exercise the library; only a count is checked, so
+            # take the trace ID count rather than walking every segment
             try:
                 traces = MS3TraceList.from_file(filename, unpack_data=True)
-                segment_count = sum(len(tid) for tid in traces)
+                trace_count = len(traces)
             except Exception:
-                segment_count = 0
+                trace_count = 0
 
             # Get any messages generated in this thread
             messages = get_error_messages()
 
-            with results_lock:
-                results[f"thread_{thread_id}"] = {
-                    "log_prefix": log_prefix,
-                    "error_prefix": error_prefix,
-                    "filename": filename,
-                    "segment_count": segment_count,
-                    "messages": messages,
-                }
+            return {
+                "log_prefix": log_prefix,
+                "error_prefix": error_prefix,
+                "filename": filename,
+                "trace_count": trace_count,
+                "messages": messages,
+            }
 
         # Get test files
         files = get_test_files(count=8)
         if not files:
             pytest.skip("No test files available in tests/data/")
 
-        # Run threads
-        threads = []
-        for i, filename in enumerate(files):
-            t = threading.Thread(target=thread_worker, args=(i, filename))
-            threads.append(t)
-            t.start()
-
-        # Wait for all threads
-        for t in threads:
-            t.join()
+        # Run the workers and collect their results
+        results = list(shared_executor.map(thread_worker, range(len(files)), files))
 
         # Verify results
         assert len(results) == len(files)
-        for data in results.values():
-            assert data["segment_count"] >= 0
+        for data in results:
+            assert data["trace_count"] >= 0
             # Messages list should exist (may be empty if no errors)
             assert isinstance(data["messages"], list)
 
-    def test_thread_pool_executor_logging(self) -> None:
-        """Test logging with ThreadPoolExecutor."""
-        results: list[dict[str, Any]] = []
-
-        def read_file_with_logging(args: tuple[int, str]) -> dict[str, Any]:
-            """Read a file with thread-specific logging configuration."""
-            thread_id, filename = args
-            thread_name = threading.current_thread().name
+    @pytest.mark.parametrize(
+        "make_executor", [ThreadPoolExecutor, spawn_process_pool], ids=["threads", "processes"]
+    )
+    def test_pool_executor_logging(self, make_executor: Callable[..., Executor]) -> None:
+        """Test logging with a pool of worker threads or processes.
 
-            log_prefix = f"[{thread_name}-LOG] "
-            error_prefix = f"[{thread_name}-ERR] "
-
-            configure_logging(log_prefix=log_prefix, error_prefix=error_prefix)
-
-            try:
-                traces = MS3TraceList.from_file(filename, unpack_data=True)
-                segment_count = sum(len(tid) for tid in traces)
-                success = True
-            except Exception:
-                segment_count = 0
-                success = False
-
-            messages = get_error_messages()
-
-            return {
-                "thread_id": thread_id,
-                "thread_name": thread_name,
-                "filename": os.path.basename(filename),
-                "segment_count": segment_count,
-                "success": success,
-                "message_count": len(messages),
-                "messages": messages,
-            }
+        Threads share the process and each configure their own logging; worker
+        processes decode the files in parallel, unconstrained by the GIL.
+        """
+        results: list[dict[str, Any]] = []
 
         files = get_test_files(count=16)
         if not files:
             pytest.skip("No test files available in tests/data/")
 
-        # Use ThreadPoolExecutor
-        with ThreadPoolExecutor(max_workers=4) as executor:
+        with make_executor(max_workers=4) as executor:
             futures = [executor.submit(read_file_with_logging, (i, f)) for i, f in enumerate(files)]
 
             for future in as_completed(futures):
@@ -190,23 +222,20 @@ class TestThreadedLogging:
         assert len(results) == len(files)
 
         # Print summary for debugging
-        print(f"\nProcessed {len(results)} files across threads:")
+        print(f"\nProcessed {len(results)} files across workers:")
         for r in sorted(results, key=lambda x: x["thread_id"]):
             print(
                 f"  {r['thread_name']}: {r['filename']} - "
                 f"{r['segment_count']} segments, {r['message_count']} messages"
             )
 
-    def test_error_messages_with_thread_prefix(self) -> None:
+    def test_error_messages_with_thread_prefix(self, shared_executor: ThreadPoolExecutor) -> None:
         """Test that error messages include the configured prefix."""
         from pymseed import MiniSEEDError, MS3Record
 
-        results: dict[int, dict[str, Any]] = {}
-        results_lock = threading.Lock()
-
         corrupted_data = get_corrupted_record()
 
-        def thread_with_error(thread_id: int) -> None:
+        def thread_with_error(thread_id: int) -> dict[str, Any]:
             """Thread that triggers an error and captures messages."""
             error_prefix = f"[THREAD-{thread_id}] "
 
@@ -222,76 +251,75 @@ class TestThreadedLogging:
 
             messages = get_error_messages()
 
-            with results_lock:
-                results[thread_id] = {
-                    "error_prefix": error_prefix,
-                    "messages": messages,
-                }
+            return {
+                "error_prefix": error_prefix,
+                "messages": messages,
+            }
 
         # Run multiple threads that each trigger errors
-        threads = []
-        for i in range(4):
-            t = threading.Thread(target=thread_with_error, args=(i,))
-            threads.append(t)
-            t.start()
-
-        for t in threads:
-            t.join()
+        results = list(shared_executor.map(thread_with_error, range(4)))
 
         # Verify each thread got messages
         assert len(results) == 4
-        for thread_id, data in results.items():
+        for thread_id, data in enumerate(results):
             assert len(data["messages"]) >= 1, f"Thread {thread_id} should have error messages"
             # Check that at least one message contains expected error info
             all_messages = " ".join(data["messages"])
             assert "CRC" in all_messages, f"Thread {thread_id} messages should mention CRC"
 
-    def test_concurrent_configure_logging_calls(self) -> None:
+    def test_concurrent_configure_logging_calls(self, shared_executor: ThreadPoolExecutor) -> None:
         """Test that concurrent configure_logging calls don't cause issues."""
-        errors: list[Exception] = []
-        errors_lock = threading.Lock()
 
-        def reconfigure_repeatedly(thread_id: int, iterations: int) -> None:
-            """Repeatedly reconfigure logging."""
-            for i in range(iterations):
+        def reconfigure_repeatedly(thread_id: int, iterations: int) -> list[Exception]:
+            """Repeatedly reconfigure logging, returning any errors raised."""
+            # Build the configurations first so the loop only reconfigures
+            configs = [
+                (f"[T{thread_id}-{i}-LOG] ", f"[T{thread_id}-{i}-ERR] ", 5 + (i % 10))
+                for i in range(iterations)
+            ]
+            errors: list[Exception] = []
+            for log_prefix, error_prefix, max_messages in configs:
                 try:
                     configure_logging(
-                        log_prefix=f"[T{thread_id}-{i}-LOG] ",
-                        error_prefix=f"[T{thread_id}-{i}-ERR] ",
-                        max_messages=5 + (i % 10),
+                        log_prefix=log_prefix,
+                        error_prefix=error_prefix,
+                        max_messages=max_messages,
                     )
                 except Exception as e:
-                    with errors_lock:
-                        errors.append(e)
-
-        # Run many threads that all reconfigure logging concurrently
-        threads = []
-        for i in range(10):
-            t = threading.Thread(target=reconfigure_repeatedly, args=(i, 50))
-            threads.append(t)
-            t.start()
+                    errors.append(e)
+            return errors
 
-        for t in threads:
-            t.join()
+        # Run a thread per core, two to eight, that all reconfigure logging
+        # concurrently, enough iterations each to cycle every max_messages value
+        num_threads = max(2, min(8, os.cpu_count() or 1))
+        iterations = 20
+        errors = [
+            e
+            for errs in shared_executor.map(
+                reconfigure_repeatedly, range(num_threads), repeat(iterations)
+            )
+            for e in errs
+        ]
 
         # Should complete without errors
         assert len(errors) == 0, f"Got {len(errors)} errors: {errors}"
 
-    def test_mixed_read_and_configure(self) -> None:
+    def test_mixed_read_and_configure(self, shared_executor: ThreadPoolExecutor) -> None:
         """Test mixing file reads with logging configuration changes."""
-        results: list[dict[str, Any]] = []
-        results_lock = threading.Lock()
 
-        def mixed_operations(thread_id: int, files: list[str]) -> None:
+        def mixed_operations(thread_id: int, files: list[str]) -> dict[str, Any]:
             """Perform mixed operations: configure, read, configure, read..."""
             thread_results = []
-
-            for i, filename in enumerate(files):
+            prefixes = [
+                (f"[T{thread_id}-R{i}-LOG] ", f"[T{thread_id}-R{i}-ERR] ")
+                for i in range(len(files))
+            ]
+
+            for i, (filename, (log_prefix, error_prefix)) in enumerate(
+                zip(files, prefixes, strict=True)
+            ):
                 # Reconfigure before each read
-                configure_logging(
-                    log_prefix=f"[T{thread_id}-R{i}-LOG] ",
-                    error_prefix=f"[T{thread_id}-R{i}-ERR] ",
-                )
+                configure_logging(log_prefix=log_prefix, error_prefix=error_prefix)
 
                 try:
                     traces = MS3TraceList.from_file(filename, unpack_data=True)
@@ -311,13 +339,10 @@ class TestThreadedLogging:
                     }
                 )
 
-            with results_lock:
-                results.append(
-                    {
-                        "thread_id": thread_id,
-                        "reads": thread_results,
-                    }
-                )
+            return {
+                "thread_id": thread_id,
+                "reads": thread_results,
+            }
 
         files = get_test_files(count=20)
         if not files:
@@ -327,17 +352,13 @@ class TestThreadedLogging:
         num_threads = 4
         files_per_thread = len(files) // num_threads
 
-        threads = []
+        thread_files = []
         for i in range(num_threads):
             start = i * files_per_thread
             end = start + files_per_thread if i < num_threads - 1 else len(files)
-            thread_files = files[start:end]
-            t = threading.Thread(target=mixed_operations, args=(i, thread_files))
-            threads.append(t)
-            t.start()
+            thread_files.append(files[start:end])
 
-        for t in threads:
-            t.join()
+        results = list(shared_executor.map(mixed_operations, range(num_threads), thread_files))
 
         # Verify all threads completed
         assert len(results) == num_threads
@@ -355,16 +376,15 @@ class TestLoggingIsolation:
         """Clear any existing log messages before each test."""
         clear_error_messages()
 
-    def test_messages_isolated_between_threads(self) -> None:
+    def test_messages_isolated_between_threads(self, shared_executor: ThreadPoolExecutor) -> None:
         """Test that error messages don't leak between threads."""
         from pymseed import MiniSEEDError, MS3Record
 
         corrupted_data = get_corrupted_record()
-        barrier = threading.Barrier(2)
-        results: dict[int, list[str]] = {}
-        results_lock = threading.Lock()
+        barrier = threading.Barrier(2, timeout=10)
+        post_work_barrier = threading.Barrier(2, timeout=10)
 
-        def thread_work(thread_id: int, should_error: bool) -> None:
+        def thread_work(thread_id: int, should_error: bool) -> list[str]:
             """Thread that may or may not generate errors."""
             configure_logging(error_prefix=f"[T{thread_id}] ")
             clear_error_messages()
@@ -380,39 +400,30 @@ class TestLoggingIsolation:
                 except MiniSEEDError:
                     pass
 
-            # Small delay to let other thread potentially pollute
-            import time
+            # Wait for the other thread to finish its work, so any pollution
+            # from it would already be visible here
+            post_work_barrier.wait()
 
-            time.sleep(0.01)
-
-            messages = get_error_messages()
-
-            with results_lock:
-                results[thread_id] = messages
+            return get_error_messages()
 
         # Thread 0 generates error, Thread 1 does not
-        t0 = threading.Thread(target=thread_work, args=(0, True))
-        t1 = threading.Thread(target=thread_work, args=(1, False))
-
-        t0.start()
-        t1.start()
-        t0.join()
-        t1.join()
+        f0 = shared_executor.submit(thread_work, 0, True)
+        f1 = shared_executor.submit(thread_work, 1, False)
+        results = {0: f0.result(), 1: f1.result()}
 
         # Thread 0 should have messages, Thread 1 should not
         assert len(results[0]) >= 1, "Thread 0 should have error messages"
         assert len(results[1]) == 0, "Thread 1 should NOT have error messages"
 
-    def test_clear_only_affects_current_thread(self) -> None:
+    def test_clear_only_affects_current_thread(self, shared_executor: ThreadPoolExecutor) -> None:
         """Test that clear_error_messages only clears current thread's messages."""
         from pymseed import MiniSEEDError, MS3Record
 
         corrupted_data = get_corrupted_record()
-        barrier = threading.Barrier(2)
-        results: dict[int, list[str]] = {}
-        results_lock = threading.Lock()
+        barrier = threading.Barrier(2, timeout=10)
+        post_work_barrier = threading.Barrier(2, timeout=10)
 
-        def thread_work(thread_id: int, should_clear: bool) -> None:
+        def thread_work(thread_id: int, should_clear: bool) -> list[str]:
             """Thread that generates errors and optionally clears them."""
             configure_logging(error_prefix=f"[T{thread_id}] ")
             clear_error_messages()
@@ -429,24 +440,17 @@ class TestLoggingIsolation:
 
             if should_clear:
                 clear_error_messages()
-                # Small delay
-                import time
 
-                time.sleep(0.01)
+            # Wait for the clear, so it would be visible to the other thread if
+            # it were not confined to this one
+            post_work_barrier.wait()
 
-            messages = get_error_messages()
-
-            with results_lock:
-                results[thread_id] = messages
+            return get_error_messages()
 
         # Thread 0 clears, Thread 1 does not
-        t0 = threading.Thread(target=thread_work, args=(0, True))
-        t1 = threading.Thread(target=thread_work, args=(1, False))
-
-        t0.start()
-        t1.start()
-        t0.join()
-        t1.join()
+        f0 = shared_executor.submit(thread_work, 0, True)
+        f1 = shared_executor.submit(thread_work, 1, False)
+        results = {0: f0.result(), 1: f1.result()}
 
         # Thread 0 cleared its messages, Thread 1 should still have them
         assert len(results[0]) == 0, "Thread 0 should have no messages after clear"
@@ -544,40 +548,41 @@ class TestUnconfiguredThreadLogging:
 
 if __name__ == "__main__":
     # Run tests directly for debugging
+    executor = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 2))
     test = TestThreadedLogging()
     test.setup_method()
 
     print("Running test_configure_logging_per_thread...")
     try:
-        test.test_configure_logging_per_thread()
+        test.test_configure_logging_per_thread(executor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
 
-    print("\nRunning test_thread_pool_executor_logging...")
+    print("\nRunning test_pool_executor_logging...")
     try:
-        test.test_thread_pool_executor_logging()
+        test.test_pool_executor_logging(ThreadPoolExecutor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
 
     print("\nRunning test_error_messages_with_thread_prefix...")
     try:
-        test.test_error_messages_with_thread_prefix()
+        test.test_error_messages_with_thread_prefix(executor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
 
     print("\nRunning test_concurrent_configure_logging_calls...")
     try:
-        test.test_concurrent_configure_logging_calls()
+        test.test_concurrent_configure_logging_calls(executor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
 
     print("\nRunning test_mixed_read_and_configure...")
     try:
-        test.test_mixed_read_and_configure()
+        test.test_mixed_read_and_configure(executor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
@@ -588,7 +593,7 @@ if __name__ == "__main__":
     print("\nRunning test_messages_isolated_between_threads...")
     try:
         isolation_test.setup_method()
-        isolation_test.test_messages_isolated_between_threads()
+        isolation_test.test_messages_isolated_between_threads(executor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
@@ -596,7 +601,9 @@ if __name__ == "__main__":
     print("\nRunning test_clear_only_affects_current_thread...")
     try:
         isolation_test.setup_method()
-        isolation_test.test_clear_only_affects_current_thread()
+        isolation_test.test_clear_only_affects_current_thread(executor)
         print("  PASSED")
     except Exception as e:
         print(f"  FAILED: {e}")
+
+    executor.shutdown()
@@ -2,6 +2,7 @@ import array
 import gc
 import io
 import math
+import mmap
 import os
 import time
 import warnings
@@ -20,15 +21,46 @@ from pymseed import (
 )
 from pymseed.clib import buffer_pointer
 from pymseed.logging import clear_error_messages
-from tests.gc_helpers import assert_released, requires_refcounting
+from tests.gc_helpers import (
+    assert_released,
+    requires_buffer_export_lock,
+    requires_refcounting,
+)
 
 test_dir = os.path.abspath(os.path.dirname(__file__))
 test_path3 = os.path.join(test_dir, "data", "testdata-COLA-signal.mseed3")
 
+# Known samples at each end of the first (B_H_1) and last (B_H_Z) COLA trace
+COLA_BH1_FIRST6 = [-502916, -502808, -502691, -502567, -502433, -502331]
+COLA_BH1_LAST6 = [-929184, -928936, -928632, -928248, -927779, -927206]
+COLA_BHZ_FIRST6 = [-231394, -231367, -231376, -231404, -231437, -231474]
+COLA_BHZ_LAST6 = [-165263, -162103, -159002, -155907, -152810, -149774]
 
-def test_tracelist_read():
-    # Read test data from test file into a trace list
-    traces = MS3TraceList.from_file(test_path3, unpack_data=True)
+
+@pytest.fixture(scope="module")
+def cola_traces():
+    """The test file read into a trace list with data unpacked, parsed once and
+    shared by tests that only read it; tests that change a trace list must
+    read their own."""
+    return MS3TraceList.from_file(test_path3, unpack_data=True)
+
+
+@pytest.fixture(scope="module")
+def cola_traces_from_buffer():
+    """The test file read into a buffer and parsed from it into a trace list
+    with data unpacked, shared like cola_traces."""
+    with open(test_path3, "rb") as fp:
+        buffer = fp.read()
+
+    return MS3TraceList.from_buffer(buffer, unpack_data=True)
+
+
+@pytest.mark.parametrize(
+    "traces_fixture", ["cola_traces", "cola_traces_from_buffer"], ids=["file", "buffer"]
+)
+def test_tracelist_read(traces_fixture, request):
+    # Test data read from test file, directly or from a buffer, into a trace list
+    traces = request.getfixturevalue(traces_fixture)
 
     assert len(traces) == 3
 
@@ -65,10 +97,10 @@ def test_tracelist_read():
     data = segment.datasamples
 
     # Check first 6 samples
-    assert data[0:6].tolist() == [-502916, -502808, -502691, -502567, -502433, -502331]
+    assert data[0:6].tolist() == COLA_BH1_FIRST6
 
     # Check last 6 samples
-    assert data[-6:].tolist() == [-929184, -928936, -928632, -928248, -927779, -927206]
+    assert data[-6:].tolist() == COLA_BH1_LAST6
 
     # Search for a specific TraceID
     foundid = traces.get_traceid("FDSN:IU_COLA_00_B_H_Z")
@@ -83,24 +115,10 @@ def test_tracelist_read():
     foundseg = foundid[0]
 
     # Check first 6 samples
-    assert foundseg.datasamples[0:6].tolist() == [
-        -231394,
-        -231367,
-        -231376,
-        -231404,
-        -231437,
-        -231474,
-    ]
+    assert foundseg.datasamples[0:6].tolist() == COLA_BHZ_FIRST6
 
     # Check last 6 samples
-    assert foundseg.datasamples[-6:].tolist() == [
-        -165263,
-        -162103,
-        -159002,
-        -155907,
-        -152810,
-        -149774,
-    ]
+    assert foundseg.datasamples[-6:].tolist() == COLA_BHZ_LAST6
 
 
 def test_tracelist_segment_update_time():
@@ -176,85 +194,45 @@ def test_tracelist_read_buffer_itemsize_views():
         assert got == expected, f"{label}: read {got}, expected {expected}"
 
 
-def test_tracelist_read_buffer():
-    # Read test data from test file into a buffer
+def _map_test_file():
+    """Return a read-only memory map of the test file."""
     with open(test_path3, "rb") as fp:
-        buffer = fp.read()
-
-    # Read miniSEED data from buffer into a trace list
-    traces = MS3TraceList.from_buffer(buffer, unpack_data=True)
-
-    assert len(traces) == 3
-
-    assert list(traces.sourceids()) == [
-        "FDSN:IU_COLA_00_B_H_1",
-        "FDSN:IU_COLA_00_B_H_2",
-        "FDSN:IU_COLA_00_B_H_Z",
-    ]
-
-    # Fetch first traceID
-    traceid = traces[0]
-
-    assert traceid.sourceid == "FDSN:IU_COLA_00_B_H_1"
-    assert traceid.pubversion == 4
-    assert traceid.earliest == 1267253400019539000
-    assert traceid.earliest_seconds == 1267253400.019539
-    assert traceid.latest == 1267257599969538000
-    assert traceid.latest_seconds == 1267257599.969538
+        return mmap.mmap(fp.fileno(), 0, access=mmap.ACCESS_READ)
 
-    # Fetch first trace segment
-    segment = traceid[0]
 
-    assert segment.starttime == 1267253400019539000
-    assert segment.starttime_seconds == 1267253400.019539
-    assert segment.endtime == 1267257599969538000
-    assert segment.endtime_seconds == 1267257599.969538
-    assert segment.samprate == 20.0
-    assert segment.samplecnt == 84000
-    assert segment.numsamples == 84000
-    assert segment.sampletype == "i"
-    assert segment.sampletype == "i"
+def test_tracelist_read_buffer_from_mmap(cola_traces):
+    """A read-only memory map is parsed where it lies."""
+    traces = MS3TraceList.from_buffer(_map_test_file(), unpack_data=True)
 
-    # Data sample array tests
-    data = segment.datasamples
+    assert list(traces.sourceids()) == list(cola_traces.sourceids())
+    for traceid, expected_id in zip(traces, cola_traces, strict=True):
+        for segment, expected_seg in zip(traceid, expected_id, strict=True):
+            assert segment.has_same_data(expected_seg)
 
-    # Check first 6 samples
-    assert data[0:6].tolist() == [-502916, -502808, -502691, -502567, -502433, -502331]
 
-    # Check last 6 samples
-    assert data[-6:].tolist() == [-929184, -928936, -928632, -928248, -927779, -927206]
+@requires_refcounting
+def test_tracelist_read_buffer_from_mmap_unpacked_outlives_map():
+    """Unpacked samples are the trace list's own, so the map can be closed
+    once parsing returns."""
+    mapped = _map_test_file()
+    traces = MS3TraceList.from_buffer(mapped, unpack_data=True)
 
-    # Search for a specific TraceID
-    foundid = traces.get_traceid("FDSN:IU_COLA_00_B_H_Z")
+    mapped.close()
+    assert traces[0][0].datasamples[0:6].tolist() == COLA_BH1_FIRST6
 
-    assert foundid.sourceid == "FDSN:IU_COLA_00_B_H_Z"
-    assert foundid.pubversion == 4
-    assert foundid.earliest == 1267253400019539000
-    assert foundid.earliest_seconds == 1267253400.019539
-    assert foundid.latest == 1267257599969538000
-    assert foundid.latest_seconds == 1267257599.969538
 
-    foundseg = foundid[0]
+@requires_buffer_export_lock
+def test_tracelist_read_buffer_from_mmap_held_by_record_list():
+    """A record list refers into the map, so the trace list keeps it exported
+    until the trace list is closed."""
+    mapped = _map_test_file()
+    traces = MS3TraceList.from_buffer(mapped, record_list=True)
 
-    # Check first 6 samples
-    assert foundseg.datasamples[0:6].tolist() == [
-        -231394,
-        -231367,
-        -231376,
-        -231404,
-        -231437,
-        -231474,
-    ]
+    with pytest.raises(BufferError):
+        mapped.close()
 
-    # Check last 6 samples
-    assert foundseg.datasamples[-6:].tolist() == [
-        -165263,
-        -162103,
-        -159002,
-        -155907,
-        -152810,
-        -149774,
-    ]
+    traces.close()
+    mapped.close()
 
 
 class _PackFreeTracker:
@@ -357,7 +335,7 @@ def test_tracelist_time_str_sentinels():
     assert traceid.latest_str() == "ERROR"
 
 
-def test_tracelist_sampletype_returns_none_when_unset():
+def test_tracelist_sampletype_returns_none_when_unset(cola_traces):
     """MS3TraceSeg.sampletype must return None when the underlying C struct
     has no sample-type byte set (zero byte). The old truthiness check
     ``if self._seg.sampletype:`` was always True because CFFI char fields
@@ -372,8 +350,7 @@ def test_tracelist_sampletype_returns_none_when_unset():
     assert seg.sampletype is None
 
     # Once decoded, the property surfaces the actual ASCII code.
-    traces = MS3TraceList.from_file(test_path3, unpack_data=True)
-    seg = next(iter(traces))[0]
+    seg = next(iter(cola_traces))[0]
     assert seg.sampletype == "i"
 
 
@@ -833,7 +810,7 @@ def test_tracelist_add_file_retains_one_buffer_per_path(tmp_path):
             assert seg.unpack_recordlist() == seg.samplecnt
 
 
-def test_tracelist_has_same_data_short_circuits_on_sampletype():
+def test_tracelist_has_same_data_short_circuits_on_sampletype(cola_traces):
     """has_same_data() must consult sampletype before the byte-level
     memoryview comparison. memoryview equality is value-based across formats
     (e.g. ``memoryview(b"abc") == memoryview(array('i', [97,98,99]))`` is
@@ -845,8 +822,7 @@ def test_tracelist_has_same_data_short_circuits_on_sampletype():
 
     from pymseed.mstracelist import MS3TraceSeg
 
-    traces = MS3TraceList.from_file(test_path3, unpack_data=True)
-    traceid = traces.get_traceid("FDSN:IU_COLA_00_B_H_Z")
+    traceid = cola_traces.get_traceid("FDSN:IU_COLA_00_B_H_Z")
     seg = traceid[0]
 
     assert seg.has_same_data(seg) is True
@@ -985,6 +961,23 @@ def test_unpack_recordlist_from_temporary_tracelist():
     assert segment.datasamples[0:3].tolist() == [-502916, -502808, -502691]
 
 
+def test_unpack_recordlist_again_returns_without_decoding():
+    """A second unpack into internal memory returns the samples already there
+    instead of failing on libmseed's already-allocated buffer."""
+    segment = MS3TraceList.from_file(test_path3, record_list=True)[0][0]
+
+    assert segment.unpack_recordlist() == segment.samplecnt
+    datasamples = segment._seg.datasamples
+
+    assert segment.unpack_recordlist() == segment.samplecnt
+    assert segment._seg.datasamples == datasamples
+    assert segment.datasamples[0:6].tolist() == COLA_BH1_FIRST6
+
+    # Unpacking into a caller's buffer still refuses once samples are present
+    with pytest.raises(ValueError, match="already unpacked"):
+        segment.unpack_recordlist(bytearray(segment.samplecnt * 4))
+
+
 def test_tracelist_read_recordlist():
     traces = MS3TraceList(test_path3, unpack_data=False, record_list=True)
 
@@ -1015,38 +1008,20 @@ def test_tracelist_read_recordlist():
     assert foundseg.numsamples == 84000
 
     # Check first 6 samples
-    assert foundseg.datasamples[0:6].tolist() == [
-        -231394,
-        -231367,
-        -231376,
-        -231404,
-        -231437,
-        -231474,
-    ]
+    assert foundseg.datasamples[0:6].tolist() == COLA_BHZ_FIRST6
 
     # Check last 6 samples
-    assert foundseg.datasamples[-6:].tolist() == [
-        -165263,
-        -162103,
-        -159002,
-        -155907,
-        -152810,
-        -149774,
-    ]
+    assert foundseg.datasamples[-6:].tolist() == COLA_BHZ_LAST6
 
-    # Traverse the record list counting records and samples
-    record_count = 0
-    sample_count = 0
-    for record_ptr in foundseg.recordlist.records():
-        record_count += 1
-        sample_count += record_ptr.record.samplecnt
+    # The records in the list account for every sample in the segment
+    recordlist = foundseg.recordlist
 
-    assert record_count == 386
-    assert sample_count == 84000
+    assert len(recordlist) == 386
+    assert sum(record_ptr.record.samplecnt for record_ptr in recordlist.records()) == 84000
 
 
-def test_tracelist_slicing():
-    traces = MS3TraceList(test_path3, unpack_data=True)
+def test_tracelist_slicing(cola_traces):
+    traces = cola_traces
 
     assert len(traces) == 3
 
@@ -1069,6 +1044,43 @@ def test_tracelist_slicing():
     assert len(traces[0:1][0]) == 1
 
 
+def test_tracelist_indexing_matches_iteration():
+    """Integer indexing, including negative indices, returns the same entry as
+    iteration for trace IDs, segments and record pointers."""
+    traces = MS3TraceList.from_file(test_path3, record_list=True)
+
+    sourceids = [traceid.sourceid for traceid in traces]
+    assert [traces[i].sourceid for i in range(len(traces))] == sourceids
+    assert [traces[i].sourceid for i in range(-len(traces), 0)] == sourceids
+
+    offsets = [record_ptr.fileoffset for record_ptr in traces[0][0].recordlist]
+    recordlist = traces[0][0].recordlist
+    assert [recordlist[i].fileoffset for i in range(len(recordlist))] == offsets
+    assert recordlist[-1].fileoffset == offsets[-1]
+
+    # Gaps between the additions create separate segments
+    gapped = MS3TraceList()
+    for second in (0, 10, 20):
+        gapped.add_data(
+            sourceid="FDSN:XX_TEST__B_S_1",
+            data_samples=[1, 2, 3],
+            sample_type="i",
+            sample_rate=1.0,
+            starttime=second * NSTMODULUS,
+        )
+    traceid = gapped[0]
+
+    starttimes = [segment.starttime for segment in traceid]
+    assert len(starttimes) == 3
+    assert [traceid[i].starttime for i in range(3)] == starttimes
+    assert [traceid[i].starttime for i in range(-3, 0)] == starttimes
+
+    with pytest.raises(IndexError):
+        traceid[3]
+    with pytest.raises(IndexError):
+        traceid[-4]
+
+
 def test_tracelist_contains():
     traces = MS3TraceList(test_path3)
 
@@ -1117,10 +1129,10 @@ def test_tracelist_numpy():
     assert np_data.shape == (84000,)
 
     # Check first 6 samples
-    assert np.all(np_data[0:6] == [-502916, -502808, -502691, -502567, -502433, -502331])
+    assert np.array_equal(np_data[0:6], COLA_BH1_FIRST6)
 
     # Check last 6 samples
-    assert np.all(np_data[-6:] == [-929184, -928936, -928632, -928248, -927779, -927206])
+    assert np.array_equal(np_data[-6:], COLA_BH1_LAST6)
 
     # Search for a specific TraceID
     foundid = traces.get_traceid("FDSN:IU_COLA_00_B_H_Z")
@@ -1132,30 +1144,10 @@ def test_tracelist_numpy():
     foundseg.unpack_recordlist()
 
     # Check first 6 samples
-    assert np.all(
-        foundseg.np_datasamples[0:6].tolist()
-        == [
-            -231394,
-            -231367,
-            -231376,
-            -231404,
-            -231437,
-            -231474,
-        ]
-    )
+    assert np.array_equal(foundseg.np_datasamples[0:6], COLA_BHZ_FIRST6)
 
     # Check last 6 samples
-    assert np.all(
-        foundseg.np_datasamples[-6:].tolist()
-        == [
-            -165263,
-            -162103,
-            -159002,
-            -155907,
-            -152810,
-            -149774,
-        ]
-    )
+    assert np.array_equal(foundseg.np_datasamples[-6:], COLA_BHZ_LAST6)
 
 
 def test_tracelist_numpy_arrayfrom_recordlist():
@@ -1183,48 +1175,31 @@ def test_tracelist_numpy_arrayfrom_recordlist():
     assert np_data.shape == (84000,)
 
     # Check first 6 samples
-    assert np.all(
-        np_data[0:6].tolist()
-        == [
-            -231394,
-            -231367,
-            -231376,
-            -231404,
-            -231437,
-            -231474,
-        ]
-    )
+    assert np.array_equal(np_data[0:6], COLA_BHZ_FIRST6)
 
     # Check last 6 samples
-    assert np.all(
-        np_data[-6:].tolist()
-        == [
-            -165263,
-            -162103,
-            -159002,
-            -155907,
-            -152810,
-            -149774,
-        ]
-    )
+    assert np.array_equal(np_data[-6:], COLA_BHZ_LAST6)
+
+
+# Sine values for each whole degree covered by the generated test data,
+# truncated to int32 as in the reference pack files
+SINE_SERIES = array.array("i", (int(math.sin(math.radians(x)) * 500) for x in range(2000)))
 
 
-# A sine wave generator
 def sine_generator(start_degree=0, yield_count=100, total=1000):
     """A generator returning a continuing sequence of sine values."""
-    generated = 0
-    while generated < total:
-        chunk_size = min(yield_count, total - generated)
+    if start_degree + total > len(SINE_SERIES):
+        raise ValueError(f"Sine series covers {len(SINE_SERIES)} degrees")
 
-        # Yield a list of continuing sine values
-        yield [
-            int(math.sin(math.radians(x)) * 500)
-            for x in range(start_degree, start_degree + chunk_size)
-        ]
+    # Yield int32 views of the precomputed series, which add_data() uses as
+    # typed buffers rather than converting element by element
+    series = memoryview(SINE_SERIES)
+    for offset in range(start_degree, start_degree + total, yield_count):
+        yield series[offset : min(offset + yield_count, start_degree + total)]
 
-        start_degree += chunk_size
-        generated += chunk_size
 
+# Start time of the generated test data, matching the reference pack files
+PACK_STARTTIME = timestr2nstime("2024-01-01T15:13:55.123456789Z")
 
 # A global record buffer
 record_buffer = bytearray()
@@ -1234,8 +1209,7 @@ def record_handler(record, handler_data):
     """A callback function for MSTraceList.set_record_handler()
     Adds the record to a global buffer for testing
     """
-    global record_buffer
-    record_buffer.extend(bytes(record))
+    record_buffer.extend(record)
 
 
 test_pack3 = os.path.join(test_dir, "data", "packtest_sine2000.mseed3")
@@ -1249,7 +1223,7 @@ def test_mstracelist_pack():
     total_samples = 0
     total_records = 0
     sample_rate = 40.0
-    starttime = timestr2nstime("2024-01-01T15:13:55.123456789Z")
+    starttime = PACK_STARTTIME
     format_version = 3
     max_record_length = 512
 
@@ -1400,6 +1374,39 @@ def test_np_datasamples_view_holds_the_trace_list():
     assert np.array_equal(view, np.array(samples, dtype=np.int32))
 
 
+def test_np_datasamples_is_a_view_of_the_segment_buffer():
+    """Each access wraps the segment's sample buffer in place, for every
+    sample type, rather than copying the samples out."""
+    np = pytest.importorskip("numpy")
+
+    traces = MS3TraceList()
+    for sourceid, samples, sample_type in (
+        ("FDSN:XX_TEST__B_S_I", [1, 2, 3, 4], "i"),
+        ("FDSN:XX_TEST__B_S_F", [1.5, 2.5, 3.5, 4.5], "f"),
+        ("FDSN:XX_TEST__B_S_D", [1.25, 2.25, 3.25, 4.25], "d"),
+    ):
+        traces.add_data(
+            sourceid=sourceid,
+            data_samples=samples,
+            sample_type=sample_type,
+            sample_rate=1.0,
+            starttime_str="2024-01-01T00:00:00Z",
+        )
+
+    for traceid in traces:
+        seg = traceid[0]
+        first = seg.np_datasamples
+        second = seg.np_datasamples
+
+        assert np.shares_memory(first, second)
+        assert np.shares_memory(first, np.asarray(seg.datasamples))
+
+        # A write through one view is seen by the next
+        first[0] = 42
+        assert seg.np_datasamples[0] == 42
+        assert seg.datasamples[0] == 42
+
+
 def test_take_np_datasamples_matches_np_datasamples_for_every_sample_type():
     """The taken array must carry the same values as the equivalent view."""
     np = pytest.importorskip("numpy")
@@ -1653,12 +1660,12 @@ def test_mstracelist_generate_rollingbuffer():
     traces = MS3TraceList()
 
     sample_rate = 40.0
-    starttime = timestr2nstime("2024-01-01T15:13:55.123456789Z")
+    starttime = PACK_STARTTIME
     format_version = 3
     max_record_length = 512
 
     # Test creation of a miniSEED v3 records
-    record_buffer = b""
+    record_buffer = bytearray()
     record_count = 0
 
     # Mimic generating miniSEED records from a continuous data stream by adding
@@ -1861,7 +1868,7 @@ def test_mstracelist_generate():
     traces = MS3TraceList()
 
     sample_rate = 40.0
-    starttime = timestr2nstime("2024-01-01T15:13:55.123456789Z")
+    starttime = PACK_STARTTIME
     max_record_length = 512
 
     # Add 3 traces to the list
@@ -1888,14 +1895,10 @@ def test_mstracelist_generate():
     )
 
     # Test creation of a miniSEED v3 records
-    record_buffer = b""
-    record_count = 0
+    records = list(traces.generate(max_record_length=max_record_length, format_version=3))
+    record_buffer = b"".join(records)
 
-    for record in traces.generate(max_record_length=max_record_length, format_version=3):
-        record_buffer += record
-        record_count += 1
-
-    assert record_count == 6
+    assert len(records) == 6
     assert len(record_buffer) == 2082
 
     with open(test_pack3_x3, "rb") as f:
@@ -1903,14 +1906,10 @@ def test_mstracelist_generate():
         assert record_buffer == data_v3
 
     # Test creation of a miniSEED v2 records
-    record_buffer = b""
-    record_count = 0
-
-    for record in traces.generate(max_record_length=max_record_length, format_version=2):
-        record_buffer += record
-        record_count += 1
+    records = list(traces.generate(max_record_length=max_record_length, format_version=2))
+    record_buffer = b"".join(records)
 
-    assert record_count == 6
+    assert len(records) == 6
     assert len(record_buffer) == 3072
 
     with open(test_pack2_x3, "rb") as f:
@@ -1932,7 +1931,7 @@ def test_mstracelist_to_file(tmp_path):
     traces = MS3TraceList()
 
     sample_rate = 40.0
-    starttime = timestr2nstime("2024-01-01T15:13:55.123456789Z")
+    starttime = PACK_STARTTIME
 
     for new_data in sine_generator(yield_count=100, total=2000):
         traces.add_data(